@@ -49,8 +49,9 @@ class EpochTimer(Attachment):  # pragma: no cover
     _epoch_start_time = "_epoch_start_time"
 
     def attach_on(self, runner: Runner) -> None:
-        runner.on(Event._ETIMER_STARTED, self._start)
-        runner.on(Event._ETIMER_FINISHED, self._finish)
+        runner.on_many(
+            {Event._ETIMER_STARTED: self._start, Event._ETIMER_FINISHED: self._finish}
+        )
 
     def _start(self, state):
         if state["max_epoch"] > 1:
@@ -115,9 +116,13 @@ class ProgressBar(Attachment):
         self._pbar: tqdm
 
     def attach_on(self, runner: Runner) -> None:
-        runner.on(Event._PBAR_CREATED, self._create)
-        runner.on(Event._PBAR_UPDATED, self._update)
-        runner.on(Event._PBAR_CLOSED, self._close)
+        runner.on_many(
+            {
+                Event._PBAR_CREATED: self._create,
+                Event._PBAR_UPDATED: self._update,
+                Event._PBAR_CLOSED: self._close,
+            }
+        )
 
     def _create(self, state: dict) -> None:
         n_items_so_far = state.get(self._n_items_so_far, 0)
@@ -170,15 +175,16 @@ class LambdaReducer(Attachment):
         self.name = name
         self._reduce_fn = reduce_fn
         self._value = value
+        self._result = f"_{name}_reducer_result"
 
     def attach_on(self, runner: Runner) -> None:
-        runner.on(Event._REDUCER_RESET, self._reset)
-        runner.on(Event._REDUCER_UPDATED, self._update)
-        runner.on(Event._REDUCER_COMPUTED, self._compute)
-
-    @property
-    def _result(self) -> str:
-        return f"_{self.name}_reducer_result"
+        runner.on_many(
+            {
+                Event._REDUCER_RESET: self._reset,
+                Event._REDUCER_UPDATED: self._update,
+                Event._REDUCER_COMPUTED: self._compute,
+            }
+        )
 
     def _reset(self, state: dict) -> None:
         if self._result in state:  # pragma: no cover
@@ -189,10 +195,8 @@ class LambdaReducer(Attachment):
         state[self._result] = None
 
     def _update(self, state: dict) -> None:
-        if state[self._result] is None:
-            state[self._result] = state[self._value]
-        else:
-            state[self._result] = self._reduce_fn(state[self._result], state[self._value])
+        result, value = state[self._result], state[self._value]
+        state[self._result] = value if result is None else self._reduce_fn(result, value)
 
     def _compute(self, state: dict) -> None:
         state[self.name] = state.pop(self._result)
@@ -230,10 +234,7 @@ class MeanReducer(LambdaReducer):
     def __init__(self, name: str, *, value: str = "output", size: str = "size",) -> None:
         super().__init__(name, lambda x, y: x + y, value=value)
         self._size = size
-
-    @property
-    def _total_size(self) -> str:
-        return f"_{self.name}_reducer_total_size"
+        self._total_size = f"_{name}_reducer_total_size"
 
     def _reset(self, state: dict) -> None:
         super()._reset(state)
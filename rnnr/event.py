@@ -12,10 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from enum import Enum, auto
+from enum import IntEnum, auto
 
 
-class Event(Enum):
+class Event(IntEnum):
     """An enumeration of events.
 
     Attributes:
@@ -26,6 +26,10 @@ class Event(Enum):
         FINISHED: Emitted once at the end of a run.
     """
 
+    # Number events from 0 so they can index a list
+    def _generate_next_value_(name, start, count, last_values):
+        return count
+
     STARTED = auto()
     EPOCH_STARTED = auto()
     BATCH = auto()
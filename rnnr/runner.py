@@ -12,13 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import defaultdict
-from typing import Any, Callable, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
 from .event import Event
 
 Callback = Callable[[dict], None]
 
+# State keys resume always needs; _batches_iter is checked separately, as it is only
+# needed when the last epoch is unfinished
+_RESUME_KEYS = frozenset(("batches", "max_epoch", "n_iters", "epoch"))
+
+# Events emitted on every batch, in order
+_BATCH_EVENTS = (Event.BATCH, Event._REDUCER_UPDATED, Event._PBAR_UPDATED)
+
 
 class Runner:
     """A neural network runner.
@@ -43,6 +49,8 @@ class Runner:
 
     Note:
         Callbacks for an event are called in the order they are passed to `~Runner.on`.
+        A callback added to an event while that event is being emitted is first called
+        the next time the event is emitted.
 
     Caution:
         All the state contents above are required for a runner to function properly.
@@ -51,7 +59,22 @@ class Runner:
 
     def __init__(self) -> None:
         self.state: dict = {}
-        self._callbacks: Dict[Event, List[Callback]] = defaultdict(list)
+        self._callbacks: List[Tuple[Callback, ...]] = [() for _ in Event]
+        self._emitters: List[Optional[Callback]] = [None for _ in Event]
+        self._batch_emitter: Optional[Callback] = None  # emits all of _BATCH_EVENTS
+        self._stale: Set[Event] = set()  # events whose emitters need rebuilding
+
+    def __getstate__(self) -> dict:
+        # Generated emitters can't be pickled, so leave them out and rebuild them on load
+        attrs = self.__dict__.copy()
+        del attrs["_emitters"], attrs["_batch_emitter"], attrs["_stale"]
+        return attrs
+
+    def __setstate__(self, attrs: dict) -> None:
+        self.__dict__.update(attrs)
+        self._emitters = [None for _ in Event]
+        self._batch_emitter = None
+        self._stale = set(Event)
 
     def on(self, event: Event, callbacks=None):
         """Add single/multiple callback(s) to listen to an event.
@@ -68,19 +91,27 @@ class Runner:
             A decorator which accepts a callback, if ``callbacks`` is ``None``.
         """
         if callbacks is not None:
-            cblist = self._callbacks[event]
-            try:
-                cblist.extend(callbacks)
-            except TypeError:  # must be a single callback
-                cblist.append(callbacks)
+            self._add({event: _as_list(callbacks)})
             return
 
         def decorator(cb: Callback) -> Callback:
-            self._callbacks[event].append(cb)
+            self._add({event: [cb]})
             return cb
 
         return decorator
 
+    def on_many(self, callbacks: Mapping[Event, Any]) -> None:
+        """Add callbacks to listen to several events at once.
+
+        This is equivalent to calling `~Runner.on` for each event, but the runner prepares
+        the dispatch of the new callbacks only once.
+
+        Args:
+            callbacks: Mapping from an event to its single/multiple callback(s), which are
+                added as in `~Runner.on`.
+        """
+        self._add({event: _as_list(cbs) for event, cbs in callbacks.items()})
+
     def run(self, batches: Iterable[Any], max_epoch: int = 1) -> None:
         """Run on batches for a number of epochs.
 
@@ -122,23 +153,53 @@ class Runner:
     def resume(self, repeat_last_batch: bool = False) -> None:
         """Resume runner starting from the current state.
 
+        The state can be restored from a checkpoint of a previous run, e.g. one saved with
+        `pickle`. Pickling with ``protocol=pickle.HIGHEST_PROTOCOL`` is usually the fastest.
+
+        Example:
+
+            >>> import pickle
+            >>> from rnnr import Event, Runner
+            >>> runner = Runner()
+            >>> @runner.on(Event.BATCH)
+            ... def stop_early(state):
+            ...     if state['n_iters'] == 3:
+            ...         state['running'] = False
+            ...
+            >>> runner.run(range(5), max_epoch=2)
+            >>> ckpt = pickle.dumps(runner.state, protocol=pickle.HIGHEST_PROTOCOL)
+            >>> runner = Runner()
+            >>> runner.state.update(pickle.loads(ckpt))
+            >>> runner.resume()
+            >>> runner.state['n_iters']
+            10
+
         Args:
             repeat_last_batch: Whether to repeat processing the last batch. Ignored if the
                 last epoch is finished (i.e. the batches have been exhausted).
+
+        Raises:
+            ValueError: If the state lacks any of the keys needed to resume the run.
         """
         state = self.state
+        missing = sorted(_RESUME_KEYS - state.keys())
+        if not missing:
+            finished_last_epoch = state["n_iters"] % len(state["batches"]) == 0
+            if not finished_last_epoch and "_batches_iter" not in state:
+                missing = ["_batches_iter"]
+        if missing:
+            raise ValueError(f"cannot resume, state has no {', '.join(missing)}")
         state["running"] = True
 
-        finished_last_epoch = state["n_iters"] % len(state["batches"]) == 0
-
         if not finished_last_epoch:
             self._emit(Event._ETIMER_STARTED, state)
             self._emit(Event._PBAR_CREATED, state)
 
             if repeat_last_batch:
-                self._emit(Event.BATCH, state)
-                self._emit(Event._REDUCER_UPDATED, state)
-                self._emit(Event._PBAR_UPDATED, state)
+                if self._stale:
+                    self._build_emitters()
+                if self._batch_emitter is not None:
+                    self._batch_emitter(state)
 
             self._run_epoch()
 
@@ -167,18 +228,68 @@ class Runner:
 
     def _run_epoch(self) -> None:
         state = self.state
-        while state["running"]:
-            try:
-                state["batch"] = next(state["_batches_iter"])
-            except StopIteration:
-                break
+        if not state["running"]:
+            return
+        if self._stale:
+            self._build_emitters()
+        if self._batch_emitter is None:
+            # Nothing listens on batches, so nothing can stop the run before the epoch ends
+            for batch in state["_batches_iter"]:
+                state["batch"] = batch
+                state["n_iters"] += 1
+            return
+        for batch in state["_batches_iter"]:
+            state["batch"] = batch
             state["n_iters"] += 1
-            self._emit(Event.BATCH, state)
-            self._emit(Event._REDUCER_UPDATED, state)
-            self._emit(Event._PBAR_UPDATED, state)
-
-    def _emit(self, event: Event, state: dict) -> None:
-        for callback in self._callbacks[event]:
+            if self._stale:  # a callback added callbacks
+                self._build_emitters()
+            self._batch_emitter(state)
             if not state["running"]:
                 break
-            callback(state)
+
+    def _add(self, callbacks: Mapping[Event, List[Callback]]) -> None:
+        for event, cblist in callbacks.items():
+            self._callbacks[event] += tuple(cblist)
+        self._stale.update(callbacks)
+
+    def _build_emitters(self) -> None:
+        batch_changed = False
+        for event in self._stale:
+            if event in _BATCH_EVENTS:  # only ever emitted through the batch emitter
+                batch_changed = True
+            else:
+                self._emitters[event] = _fuse(self._callbacks[event])
+        if batch_changed:
+            self._batch_emitter = _fuse(sum((self._callbacks[e] for e in _BATCH_EVENTS), ()))
+        self._stale.clear()
+
+    def _emit(self, event: Event, state: dict) -> None:
+        if self._stale:
+            self._build_emitters()
+        emit = self._emitters[event]
+        if emit is not None:
+            emit(state)
+
+
+def _as_list(callbacks: Any) -> List[Callback]:
+    try:
+        return list(callbacks)
+    except TypeError:  # must be a single callback
+        return [callbacks]
+
+
+def _fuse(callbacks: Sequence[Callback]) -> Optional[Callback]:
+    # Generate a single function that calls the callbacks one after another, stopping as
+    # soon as state['running'] is False, so emitting an event needs no loop over the list.
+    # Return None if there are no callbacks so the event can be skipped altogether.
+    if not callbacks:
+        return None
+    names = [f"cb{i}" for i in range(len(callbacks))]
+    lines = ["def emit(state):"]
+    for name in names:
+        lines.append('    if not state["running"]:')
+        lines.append("        return")
+        lines.append(f"    {name}(state)")
+    namespace: Dict[str, Any] = dict(zip(names, callbacks))
+    exec(compile("\n".join(lines), "<fused>", "exec"), namespace)
+    return namespace["emit"]
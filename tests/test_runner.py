@@ -1,4 +1,3 @@
-from unittest.mock import Mock
 import pickle
 
 import pytest
@@ -11,6 +10,19 @@ def test_init():
     assert len(r.state) == 0
 
 
+def test_pickle(runner):
+    runner.on(Event.STARTED, len)
+    runner.on(Event.BATCH, _record_batch)
+    runner = pickle.loads(pickle.dumps(runner))
+    runner.run(range(3))
+
+    assert runner.state["batches_seen"] == [0, 1, 2]
+
+
+def _record_batch(state):
+    state.setdefault("batches_seen", []).append(state["batch"])
+
+
 def test_run(runner):
     batches, max_epoch = range(10), 5
     runner.run(batches, max_epoch=max_epoch)
@@ -19,6 +31,8 @@ def test_run(runner):
     assert state["batches"] == batches
     assert state["max_epoch"] == max_epoch
     assert state["n_iters"] == len(batches) * max_epoch
+    assert state["epoch"] == max_epoch
+    assert state["batch"] == batches[-1]
     assert not state["running"]
 
 
@@ -110,42 +124,115 @@ class TestOn:
         assert n_calls == max_epoch
 
     def test_multiple_callbacks(self, runner):
-        mock_escb1, mock_escb2, max_epoch = Mock(), Mock(), 10
-        runner.on(Event.EPOCH_STARTED, [mock_escb1, mock_escb2])
+        calls, max_epoch = [], 10
+        runner.on(
+            Event.EPOCH_STARTED, [lambda state: calls.append(1), lambda state: calls.append(2)]
+        )
+        runner.run(range(5), max_epoch=max_epoch)
+
+        assert calls == [1, 2] * max_epoch
+
+    def test_many_callbacks(self, runner):
+        calls, n = [], 300
+        runner.on(Event.STARTED, [lambda state: calls.append(0)] * n)
+        runner.on(Event.BATCH, [lambda state: calls.append(1)] * n)
+        runner.run(range(2))
+
+        assert calls == [0] * n + [1] * n * 2
+
+    def test_after_run(self, runner):
+        calls = []
+        runner.on(Event.STARTED, lambda state: calls.append(1))
+        runner.run(range(5))
+        runner.on(Event.STARTED, lambda state: calls.append(2))
+
+        @runner.on(Event.STARTED)
+        def on_started(state):
+            calls.append(3)
+
+        runner.run(range(5))
+
+        assert calls == [1, 1, 2, 3]
+
+    def test_during_emit(self, runner):
+        calls = []
+
+        @runner.on(Event.EPOCH_STARTED)
+        def on_epoch_started(state):
+            calls.append("a")
+            if state["epoch"] == 1:
+                runner.on(Event.EPOCH_STARTED, lambda state: calls.append("b"))
+
+        runner.run(range(5), max_epoch=2)
+
+        assert calls == ["a", "a", "b"]
+
+    def test_many(self, runner):
+        calls, max_epoch = [], 10
+        runner.on_many(
+            {
+                Event.STARTED: lambda state: calls.append(0),
+                Event.EPOCH_STARTED: [
+                    lambda state: calls.append(1),
+                    lambda state: calls.append(2),
+                ],
+            }
+        )
         runner.run(range(5), max_epoch=max_epoch)
 
-        assert mock_escb1.call_count == max_epoch
-        assert mock_escb2.call_count == max_epoch
+        assert calls == [0] + [1, 2] * max_epoch
+
+    def test_many_emission_order(self, runner):
+        calls = []
+        runner.on_many(
+            {
+                Event._PBAR_UPDATED: lambda state: calls.append("pbar"),
+                Event.EPOCH_STARTED: lambda state: calls.append("epoch"),
+                Event.BATCH: [
+                    lambda state: calls.append("batch1"),
+                    lambda state: calls.append("batch2"),
+                ],
+                Event._REDUCER_UPDATED: lambda state: calls.append("reducer"),
+            }
+        )
+        runner.run(range(2))
+
+        assert calls == ["epoch"] + ["batch1", "batch2", "reducer", "pbar"] * 2
 
 
 class TestStop:
     def test_on_batch(self, runner):
-        mock_escallback = Mock()
-        mock_efcallback = Mock()
-        n_calls = 0
+        escallback_ncalls, efcallback_ncalls, n_calls = 0, 0, 0
         batches = range(10)
 
+        def escallback(state):
+            nonlocal escallback_ncalls
+            escallback_ncalls += 1
+
         def bcallback(state):
             nonlocal n_calls
             n_calls += 1
             if state["batch"] == 3:
                 state["running"] = False
 
-        runner.on(Event.EPOCH_STARTED, mock_escallback)
+        def efcallback(state):
+            nonlocal efcallback_ncalls
+            efcallback_ncalls += 1
+
+        runner.on(Event.EPOCH_STARTED, escallback)
         runner.on(Event.BATCH, bcallback)
-        runner.on(Event.EPOCH_FINISHED, mock_efcallback)
+        runner.on(Event.EPOCH_FINISHED, efcallback)
         runner.run(batches, max_epoch=2)
 
-        assert mock_escallback.call_count == 1
-        assert mock_efcallback.call_count == 0
+        assert escallback_ncalls == 1
+        assert efcallback_ncalls == 0
         assert n_calls == 4
         assert runner.state["n_iters"] == 4
         assert runner.state["epoch"] == 1
         assert runner.state["batch"] == 3
 
     def test_on_epoch_started(self, runner):
-        mock_efcallback = Mock()
-        mock_bcallback = Mock()
+        bcallback_ncalls, efcallback_ncalls = 0, 0
 
         class MockBatches:
             n = 0
@@ -167,13 +254,21 @@ class TestStop:
             if state["epoch"] == 1:
                 state["running"] = False
 
+        def bcallback(state):
+            nonlocal bcallback_ncalls
+            bcallback_ncalls += 1
+
+        def efcallback(state):
+            nonlocal efcallback_ncalls
+            efcallback_ncalls += 1
+
         runner.on(Event.EPOCH_STARTED, escallback)
-        runner.on(Event.BATCH, mock_bcallback)
-        runner.on(Event.EPOCH_FINISHED, mock_efcallback)
+        runner.on(Event.BATCH, bcallback)
+        runner.on(Event.EPOCH_FINISHED, efcallback)
         runner.run(batches, max_epoch=7)
 
-        assert mock_efcallback.call_count == 0
-        assert mock_bcallback.call_count == 0
+        assert efcallback_ncalls == 0
+        assert bcallback_ncalls == 0
         assert batches.n == 0
 
 
@@ -202,7 +297,7 @@ class TestResume:
         runner.state["stage"] = "first"
         runner.run(batches, max_epoch)
         with open(tmp_path / "ckpt.pkl", "wb") as f:
-            pickle.dump(runner.state, f)
+            pickle.dump(runner.state, f, protocol=pickle.HIGHEST_PROTOCOL)
 
         with open(tmp_path / "ckpt.pkl", "rb") as f:
             ckpt = pickle.load(f)
@@ -246,7 +341,7 @@ class TestResume:
         runner.state["stage"] = "first"
         runner.run(batches, max_epoch)
         with open(tmp_path / "ckpt.pkl", "wb") as f:
-            pickle.dump(runner.state, f)
+            pickle.dump(runner.state, f, protocol=pickle.HIGHEST_PROTOCOL)
 
         with open(tmp_path / "ckpt.pkl", "rb") as f:
             ckpt = pickle.load(f)
@@ -292,7 +387,7 @@ class TestResume:
         runner.state["stage"] = "first"
         runner.run(batches, max_epoch)
         with open(tmp_path / "ckpt.pkl", "wb") as f:
-            pickle.dump(runner.state, f)
+            pickle.dump(runner.state, f, protocol=pickle.HIGHEST_PROTOCOL)
 
         with open(tmp_path / "ckpt.pkl", "rb") as f:
             ckpt = pickle.load(f)
@@ -308,3 +403,21 @@ class TestResume:
 
         assert bcallback_ncalls == len(batches) * max_epoch
         assert efcallback_ncalls == max_epoch
+
+    def test_missing_state_keys(self, runner):
+        runner.state.update({"batches": range(5), "epoch": 1})
+        with pytest.raises(ValueError) as exc:
+            runner.resume()
+        assert "max_epoch, n_iters" in str(exc.value)
+
+    def test_missing_batches_iter(self, runner):
+        runner.state.update({"batches": range(5), "max_epoch": 2, "n_iters": 3, "epoch": 1})
+        with pytest.raises(ValueError) as exc:
+            runner.resume()
+        assert "_batches_iter" in str(exc.value)
+
+    def test_without_running(self, runner):
+        runner.state.update({"batches": range(5), "max_epoch": 2, "n_iters": 5, "epoch": 1})
+        runner.resume()
+        assert runner.state["n_iters"] == 10
+        assert not runner.state["running"]